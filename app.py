@@ -1,4 +1,5 @@
 import asyncio
+import functools
 import json
 import logging
 import os
@@ -6,9 +7,11 @@ import random
 import subprocess
 import requests
 
-from flask import Flask, request, jsonify
+from flask import Flask, g, request, jsonify
 from pymongo import MongoClient
 
+from profiling import forward_token, profiled, should_profile, worker_env
+
 app = Flask(__name__)
 
 # Set up logging
@@ -17,12 +20,29 @@ logger = logging.getLogger(__name__)
 
 # MongoDB Atlas connection URI
 MONGO_URI = os.environ.get('MONGO_URI')
-client = MongoClient(MONGO_URI)
 
-# Access the database and collection
-db = client['tpc_survey_f1']
-collection = db['cyclic_server']
-collection2 = db['survey1_testimonials']
+
+def connect_mongo():
+    """
+    Open the MongoDB client and bind the database and collections.
+
+    Called at import time and again in each gunicorn worker after fork,
+    since a MongoClient must not be shared across forked processes.
+    """
+    global client, db, collection, collection2
+    client = MongoClient(MONGO_URI)
+
+    # Access the database and collection
+    db = client['tpc_survey_f1']
+    collection = db['cyclic_server']
+    collection2 = db['survey1_testimonials']
+
+
+connect_mongo()
+
+# Endpoint that runs the OpenAI pipeline; set empty to skip the call
+PROCESS_OPENAI_URL = os.environ.get(
+    'PROCESS_OPENAI_URL', 'https://easy-plum-stingray-toga.cyclic.app/process_openai')
 
 # Path to the openai.py script
 OPENAI_SCRIPT_PATH1 = 'openai_tg.py'
@@ -76,16 +96,21 @@ def parse_pretty_data(pretty_data):
     return extracted_data
 
 
-async def process_openai_script(inserted_id, parsed_data, contents):
+async def process_openai_script(inserted_id, parsed_data, contents, profile_token=None):
     """
     Asynchronously trigger the process_openai endpoint.
     """
+    if not PROCESS_OPENAI_URL:
+        logger.info('PROCESS_OPENAI_URL is empty, skipping process_openai')
+        return
+
     try:
         insert_id = str(inserted_id)
-        url = 'https://easy-plum-stingray-toga.cyclic.app/process_openai'
+        url = PROCESS_OPENAI_URL
         payload = {'inserted_id': insert_id,
                    'survey_responses': parsed_data,
-                   'contents': contents
+                   'contents': contents,
+                   'profile': profile_token
                    }
         response = requests.post(url, json=payload)
 
@@ -99,7 +124,31 @@ async def process_openai_script(inserted_id, parsed_data, contents):
         logger.error(f'An error occurred: {str(e)}')
 
 
+def profile_view(stage):
+    """
+    Profile a view when the request opts in or is sampled.
+
+    The view sets g.inserted_id to tag the profile; requests that never
+    insert a document are not written to disk.
+
+    Args:
+        stage (str): Name of the pipeline stage being profiled.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(*args, **kwargs):
+            enabled = should_profile(request.headers)
+            g.profile_token = forward_token(enabled)
+            with profiled(stage, enabled) as session:
+                response = await view(*args, **kwargs)
+                session.tag = g.get('inserted_id')
+            return response
+        return wrapper
+    return decorator
+
+
 @app.route('/submit-form', methods=['POST'])
+@profile_view('submit_form')
 async def submit_form():
     """
     Endpoint to handle form submissions.
@@ -123,6 +172,7 @@ async def submit_form():
         }
 
         result = collection.insert_one(document)
+        g.inserted_id = str(result.inserted_id)
 
         all_ids = [doc["_id"] for doc in collection2.find({}, {"_id": 1})]
         random_ids = random.sample(all_ids, 2)
@@ -139,7 +189,7 @@ async def submit_form():
 
         # Asynchronously process the openai.py script without awaiting the task
         asyncio.create_task(process_openai_script(
-            result.inserted_id, parsed_data, contents))
+            result.inserted_id, parsed_data, contents, g.profile_token))
 
         return jsonify({
             'message': 'Document inserted successfully',
@@ -168,7 +218,8 @@ async def process_openai():
 
         # Execute subprocess with inserted_id as command-line argument
         subprocess.run(['python', OPENAI_SCRIPT_PATH1,
-                       str(inserted_id), survey_responses_str, str(contents)], check=True)
+                       str(inserted_id), survey_responses_str, str(contents)],
+                       check=True, env=worker_env(data.get('profile')))
 
         return jsonify({'message': 'OpenAI subprocess completed successfully'}), 200
 
@@ -193,7 +244,8 @@ async def process_openai2():
 
         # Execute subprocess with summary and history as command-line arguments
         subprocess.run(['python', OPENAI_SCRIPT_PATH2,
-                       str(summary), str(history), str(insert_id)], check=True)
+                       str(summary), str(history), str(insert_id)],
+                       check=True, env=worker_env(data.get('profile')))
 
         return jsonify({'message': 'OpenAI subprocess completed successfully'}), 200
 
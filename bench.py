@@ -0,0 +1,193 @@
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+# Seconds before a single submission counts as failed
+REQUEST_TIMEOUT = 30
+
+# Worker settings compared by the default sweep
+CONFIGS = [
+    {'GUNICORN_WORKER_CLASS': 'sync', 'WEB_CONCURRENCY': '1', 'GUNICORN_THREADS': '1'},
+    {'GUNICORN_WORKER_CLASS': 'sync', 'WEB_CONCURRENCY': '4', 'GUNICORN_THREADS': '1'},
+    {'GUNICORN_WORKER_CLASS': 'gthread', 'WEB_CONCURRENCY': '2', 'GUNICORN_THREADS': '4'},
+    {'GUNICORN_WORKER_CLASS': 'gthread', 'WEB_CONCURRENCY': '4', 'GUNICORN_THREADS': '8'},
+]
+
+# Form payload in the shape Jotform posts to /submit-form
+PRETTY_DATA = (
+    "Please Enter your Email Address:bench@example.com, "
+    "How would you rate the ease of transitioning and implementation to TPC's services from your previous payroll provider?:Easy, "
+    "How user-friendly do you find iSolved, TPC's HR and payroll software?:Average, "
+    "Who was your previous Payroll Provider?:ADP, "
+    "What field or industry does your company specialize in?:Benchmarking, "
+    "How would you rate your satisfaction for TPC over your previous payroll provider?:Satisfied, "
+    "How would you rate your experience with TPC's customer service in addressing your inquiries and concerns?:Very Satisfied, "
+    "How many employees does your company currently process payroll for?:65, "
+    "How inclined are you to recommend Grant Stuart and TPC's services to another business?:Somewhat Likely, "
+    "Please share your experience or any additional feedback you have regarding your experience with Grant Stuart and TPC.:Benchmark run"
+)
+
+
+def submit(url, index):
+    """
+    Post a single form submission and time it.
+
+    Args:
+        url (str): The /submit-form URL.
+        index (int): Sequence number used for the submission ID.
+
+    Returns:
+        tuple: (elapsed seconds, HTTP status code or None on failure)
+    """
+    form = {
+        'formID': 'bench',
+        'submissionID': f'bench-{index}',
+        'webhookURL': 'http://localhost/bench',
+        'pretty': PRETTY_DATA,
+    }
+    start = time.perf_counter()
+    try:
+        response = requests.post(url, data=form, timeout=REQUEST_TIMEOUT)
+        status = response.status_code
+    except requests.RequestException:
+        status = None
+    return time.perf_counter() - start, status
+
+
+def run_load(url, requests_total, concurrency):
+    """
+    Fire concurrent submissions and summarize throughput and latency.
+
+    Returns:
+        dict: Throughput, latency percentiles and error count.
+    """
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(
+            lambda i: submit(url, i), range(requests_total)))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(r[0] for r in results)
+    errors = sum(1 for r in results if r[1] != 200)
+    return {
+        'rps': requests_total / elapsed,
+        'p50': statistics.median(latencies) * 1000,
+        'p95': latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        'errors': errors,
+    }
+
+
+def wait_for_port(port, timeout=30):
+    """
+    Block until the server accepts connections on the given port.
+    """
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'Server did not start on port {port}')
+
+
+def serve_with_mongomock():
+    """
+    Run server.py against a seeded in-memory mongomock database.
+
+    Every MongoClient shares one store created before the workers fork,
+    so each worker starts with the two testimonials /submit-form samples.
+    BENCH_MONGO_LATENCY_MS adds a sleep to each query to stand in for the
+    network round trip to Atlas.
+    """
+    import functools
+    import runpy
+
+    import mongomock
+    import pymongo
+
+    latency = float(os.environ.get('BENCH_MONGO_LATENCY_MS', '0')) / 1000
+    if latency:
+        def delayed(method):
+            @functools.wraps(method)
+            def wrapper(*args, **kwargs):
+                time.sleep(latency)
+                return method(*args, **kwargs)
+            return wrapper
+
+        for name in ('insert_one', 'find', 'find_one'):
+            setattr(mongomock.Collection, name,
+                    delayed(getattr(mongomock.Collection, name)))
+
+    client = mongomock.MongoClient()
+    pymongo.MongoClient = lambda *args, **kwargs: client
+    client['tpc_survey_f1']['survey1_testimonials'].insert_many([
+        {'short_testimonial': 'Short.', 'medium_testimonial': 'Medium.',
+         'long_testimonial': 'Long.'}
+        for _ in range(2)
+    ])
+    sys.argv = ['server.py']
+    runpy.run_path('server.py', run_name='__main__')
+
+
+def run_config(config, port, requests_total, concurrency, mongomock=False,
+               mongo_latency=0):
+    """
+    Start server.py with the given settings and benchmark it.
+    """
+    # Never trigger the real OpenAI pipeline from a benchmark
+    env = {**os.environ, **config, 'PORT': str(port), 'PROCESS_OPENAI_URL': '',
+           'BENCH_MONGO_LATENCY_MS': str(mongo_latency)}
+    command = [sys.executable, 'server.py']
+    if mongomock:
+        command = [sys.executable, 'bench.py', '--serve-mongomock']
+    server = subprocess.Popen(command, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(port)
+        url = f'http://127.0.0.1:{port}/submit-form'
+        # Warm up each worker before measuring
+        run_load(url, concurrency, concurrency)
+        return run_load(url, requests_total, concurrency)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark concurrent /submit-form throughput across worker settings.')
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--port', type=int, default=5252)
+    parser.add_argument('--mongomock', action='store_true',
+                        help='serve from a seeded in-memory database instead of MONGO_URI')
+    parser.add_argument('--mongo-latency', type=float, default=0,
+                        help='simulated milliseconds per query with --mongomock')
+    parser.add_argument('--serve-mongomock', action='store_true',
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve_mongomock:
+        serve_with_mongomock()
+        return
+
+    print('| worker class | workers | threads | req/s | p50 ms | p95 ms | errors |')
+    print('| --- | --- | --- | --- | --- | --- | --- |')
+    for config in CONFIGS:
+        result = run_config(config, args.port, args.requests,
+                            args.concurrency, args.mongomock, args.mongo_latency)
+        print(f"| {config['GUNICORN_WORKER_CLASS']} | {config['WEB_CONCURRENCY']} "
+              f"| {config['GUNICORN_THREADS']} | {result['rps']:.1f} "
+              f"| {result['p50']:.0f} | {result['p95']:.0f} | {result['errors']} |")
+
+
+if __name__ == '__main__':
+    main()
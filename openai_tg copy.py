@@ -12,6 +12,8 @@ from langchain_core.messages import HumanMessage
 from langchain_core.output_parsers import StrOutputParser
 from pymongo import MongoClient
 
+from profiling import profiled, profiling_requested
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -75,12 +77,15 @@ async def process_openai(summary, history, insert_id):
         data (dict): The data to process.
     """
     logger.info('Generating Testimonials...')
+    profile = profiling_requested()
+    tag = str(insert_id)
     insert_id = ObjectId(insert_id)
     key1 = "Please share your experience or any additional feedback you have regarding your experience with Grant Stuart and TPC."
     key3 = "How many employees does your company currently process payroll for?"
     key4 = "Who was your previous Payroll Provider?"
 
-    data = collection.find_one({"_id": insert_id})
+    with profiled('load_survey', profile, tag=tag):
+        data = collection.find_one({"_id": insert_id})
     submission_id = data['submissionID']
     survey_responses = data['survey_responses']
     amt_employees = survey_responses[key3]
@@ -98,31 +103,35 @@ async def process_openai(summary, history, insert_id):
         'input': f'Review the data: summary={summary}.\nGenerate a 60-80 word testimonial using the information provided. Rules you must follow:\n3. Include the amount of employees the company has ({amt_employees}).\n2. Mention the company ({prev_provider}). Include some of this ({additional_feedback}) if it has a positive sentiment.\n1. Do not start the testimonial with "Transitioning to TPC", "transitioning", "The transition", or "I recently transitioned".\n 4. Do not use repeating/recurring words or phrases identified in section 2 of the summary.\n5. Do not use "breeze" or "seamless".'
     }
 
-    medium_testimony = chain3.invoke(input1)
+    with profiled('medium_testimonial', profile, tag=tag):
+        medium_testimony = chain3.invoke(input1)
     # logger.info(medium_testimony)
 
     input2 = {
         'input': f'Review the data: summary={summary}.\nGenerate a 30-50 word testimonial using the information provided. Rules you must follow:\n3. Include the amount of employees the company has ({amt_employees}).\n2. Mention the company ({prev_provider}). Include some of this ({additional_feedback}) if it has a positive sentiment.\n1. Do not start the testimonial with "Transitioning to TPC", "transitioning", "The transition", or "I recently transitioned".\n 4. Do not use repeating/recurring words or phrases identified in section 2 of the summary.\n5. Do not use "breeze" or "seamless".'
     }
 
-    short_testimony = chain3.invoke(input2)
+    with profiled('short_testimonial', profile, tag=tag):
+        short_testimony = chain3.invoke(input2)
     # logger.info(short_testimony)
 
     input3 = {
         'input': f'Review the context: context={summary}.\nGenerate a 100-120 word testimonial using the information provided. Rules you must follow:\n3. Include the amount of employees the company has ({amt_employees}).\n2. Mention the previous payroll company ({prev_provider}). Include some of this ({additional_feedback}) if it has a positive sentiment.\n1. Do not start the testimonial with "Transitioning to TPC", "transitioning", "The transition", or "I recently transitioned".\n 4. Do not use repeating/recurring words or phrases identified in section 2 of the summary.\n5. Do not use "breeze" or "seamless".'
     }
 
-    long_testimony = chain3.invoke(input3)
+    with profiled('long_testimonial', profile, tag=tag):
+        long_testimony = chain3.invoke(input3)
     # logger.info(long_testimony)
 
     # Convert survey_responses to a string
     survey_responses_str = json.dumps(survey_responses)
 
     # Update the original document with conversation history
-    append_testimonials(
-        context=history, summary=summary, short=short_testimony,
-        medium=medium_testimony, long=long_testimony, submission_id=submission_id
-    )
+    with profiled('store_testimonials', profile, tag=tag):
+        append_testimonials(
+            context=history, summary=summary, short=short_testimony,
+            medium=medium_testimony, long=long_testimony, submission_id=submission_id
+        )
 
     print(type(insert_id), type(short_testimony), type(
         medium_testimony), type(long_testimony), type(survey_responses_str)
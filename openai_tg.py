@@ -14,6 +14,8 @@ from langchain_core.messages import HumanMessage, AIMessage
 from langchain_core.output_parsers import StrOutputParser
 import requests
 
+from profiling import forward_token, profiled, profiling_requested
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -63,7 +65,8 @@ async def send_post_request(summary, history, insert_id):
         payload = {
             'summary': summary,
             'history': payload_json,
-            'insert_id': insert_id
+            'insert_id': insert_id,
+            'profile': forward_token(profiling_requested())
         }
 
         response = requests.post(url, json=payload)
@@ -83,6 +86,7 @@ async def process_openai(insert_id, survey_data):
     Process data using OpenAI.
     """
     survey_responses = survey_data
+    profile = profiling_requested()
 
     prompt1 = ChatPromptTemplate.from_messages([
         ("system", "You are an AI designed to assist in testimonial generation. I provide you survey results and you do 2 things; 1. analyze sentiment. 2. Detect recurring wordage or phrasing from previous testimonials."),
@@ -108,21 +112,24 @@ async def process_openai(insert_id, survey_data):
         "input": f"Here is a survey with the '_id': {insert_id}. Please review the survey and confirm that you processed the data: Survey response = {survey_responses}"
     }
 
-    response = chain.invoke(inputs)
-    memory.save_context(inputs, {"output": response})
+    with profiled('sentiment', profile, tag=insert_id):
+        response = chain.invoke(inputs)
+        memory.save_context(inputs, {"output": response})
 
     inputs = {
         "input": f"Review these historical testimonial responses for recurring language and phrasing. Document them and we will avoid using repeat language in our future testimonial generations. Historical Documents = {contents}"
     }
-    response = chain.invoke(inputs)
-    memory.save_context(inputs, {"output": response})
+    with profiled('recurring_language', profile, tag=insert_id):
+        response = chain.invoke(inputs)
+        memory.save_context(inputs, {"output": response})
 
     history = memory.load_memory_variables({})
 
     inputs = {
         "input": f"Please review the conversation history. conversation_history = {history}, 1. Give me a summary of the original survey questions and responses. 2. List repeating words or phrases from the Historical Documents. 3. Summarize the human to ai conversation."
     }
-    summary = chain2.invoke(inputs)
+    with profiled('summary', profile, tag=insert_id):
+        summary = chain2.invoke(inputs)
 
     # Asynchronously process the openai.py script
     asyncio.create_task(send_post_request(summary, history, insert_id))
@@ -0,0 +1,214 @@
+import cProfile
+import hmac
+import logging
+import os
+import random
+import re
+import time
+from contextlib import contextmanager
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Directory where per-request profile files are written
+PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+
+# Fraction of submissions (0.0 - 1.0) to profile without the request header
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', '0'))
+
+# Request header that opts a single submission into profiling
+PROFILE_HEADER = os.environ.get('PROFILE_HEADER', 'X-Profile')
+
+# Shared secret the header value must match; header opt-in is off without it
+PROFILE_TOKEN = os.environ.get('PROFILE_TOKEN')
+
+# Retention limits for the profile directory
+PROFILE_MAX_FILES = int(os.environ.get('PROFILE_MAX_FILES', '200'))
+PROFILE_MAX_AGE = int(os.environ.get('PROFILE_MAX_AGE', '604800'))
+
+# Environment variable used to hand the decision to worker subprocesses
+PROFILE_ENV_FLAG = 'PROFILE_REQUEST'
+
+# Tags become file names, so only accept MongoDB ObjectIds
+TAG_PATTERN = re.compile(r'[0-9a-f]{24}')
+
+
+def valid_token(value):
+    """
+    Check a client-supplied value against PROFILE_TOKEN.
+
+    Args:
+        value: The header value or forwarded token.
+
+    Returns:
+        bool: True only if a token is configured and the value matches it.
+    """
+    if not PROFILE_TOKEN or not isinstance(value, str):
+        return False
+    # compare_digest rejects non-ASCII str, so compare the encoded bytes
+    return hmac.compare_digest(value.encode('utf-8', 'surrogatepass'),
+                               PROFILE_TOKEN.encode('utf-8', 'surrogatepass'))
+
+
+def should_profile(headers):
+    """
+    Decide whether the current request should be profiled.
+
+    Args:
+        headers: The incoming request headers.
+
+    Returns:
+        bool: True if the header carries the token or the request is sampled.
+    """
+    if valid_token(headers.get(PROFILE_HEADER)):
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def forward_token(enabled):
+    """
+    Value to send downstream so the worker endpoints profile too.
+
+    Args:
+        enabled (bool): Whether the current request is being profiled.
+
+    Returns:
+        str or None: PROFILE_TOKEN if profiling, otherwise None.
+    """
+    return PROFILE_TOKEN if enabled else None
+
+
+def profiling_requested():
+    """
+    Check whether the parent request asked this worker to profile.
+
+    Returns:
+        bool: True if the profiling flag is set in the environment.
+    """
+    return os.environ.get(PROFILE_ENV_FLAG) == '1'
+
+
+def worker_env(token):
+    """
+    Build the environment for a worker subprocess.
+
+    Args:
+        token: The profile token forwarded in the request payload.
+
+    Returns:
+        dict or None: The environment to pass to subprocess.run, or None to
+        inherit the current one unchanged.
+    """
+    if not valid_token(token):
+        return None
+    return {**os.environ, PROFILE_ENV_FLAG: '1'}
+
+
+class ProfileSession:
+    """
+    Handle for a profiled block; the tag can be set once it is known.
+    """
+
+    def __init__(self, stage, tag=None):
+        self.stage = stage
+        self.tag = tag
+
+
+def _remove(path):
+    """
+    Delete a profile file that another process may already have removed.
+    """
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _prune_profiles():
+    """
+    Enforce the age and count retention limits on the profile directory.
+    """
+    entries = []
+    now = time.time()
+    for name in os.listdir(PROFILE_DIR):
+        if not name.endswith('.prof'):
+            continue
+        path = os.path.join(PROFILE_DIR, name)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            continue
+        if now - mtime > PROFILE_MAX_AGE:
+            _remove(path)
+        else:
+            entries.append((mtime, path))
+
+    entries.sort(reverse=True)
+    for _, path in entries[PROFILE_MAX_FILES:]:
+        _remove(path)
+
+
+def _dump_profile(profiler, session):
+    """
+    Write the collected stats to PROFILE_DIR and apply retention.
+    """
+    tag = str(session.tag)
+    if not TAG_PATTERN.fullmatch(tag):
+        logger.warning(f'Profile for {session.stage} discarded: invalid tag {tag!r}')
+        return
+
+    try:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        filename = f'{tag}.{session.stage}.{time.time_ns()}.prof'
+        path = os.path.join(PROFILE_DIR, filename)
+        profiler.dump_stats(path)
+        logger.info(f'Profile written to {path}')
+    except Exception as e:
+        logger.error(f'Failed to write profile: {str(e)}')
+        return
+
+    try:
+        _prune_profiles()
+    except Exception as e:
+        logger.error(f'Failed to prune profiles: {str(e)}')
+
+
+@contextmanager
+def profiled(stage, enabled, tag=None):
+    """
+    Run the enclosed block under cProfile when enabled.
+
+    Profiles are written as <tag>.<stage>.<timestamp>.prof and can be read
+    with pstats or snakeviz. Blocks that end without a tag, or with a tag
+    that is not an ObjectId, are discarded.
+    When disabled the block runs untouched.
+
+    Args:
+        stage (str): Name of the pipeline stage being profiled.
+        enabled (bool): Whether to profile this block at all.
+        tag (str): The inserted_id of the submission, if already known.
+
+    Yields:
+        ProfileSession: Handle whose tag may be set inside the block.
+    """
+    session = ProfileSession(stage, tag)
+    if not enabled:
+        yield session
+        return
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as e:
+        # Another profiler is already active on this thread
+        logger.warning(f'Profiling skipped for {stage}: {str(e)}')
+        yield session
+        return
+
+    try:
+        yield session
+    finally:
+        profiler.disable()
+        if session.tag:
+            _dump_profile(profiler, session)
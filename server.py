@@ -1,5 +1,99 @@
+import multiprocessing
+import os
 import sys
-from gunicorn.app.wsgiapp import run
+
+from gunicorn.app.base import BaseApplication
+
+# Address to listen on
+PORT = os.environ.get('PORT', '5151')
+BIND = os.environ.get('GUNICORN_BIND', f'0.0.0.0:{PORT}')
+
+# Worker model: sync, gthread, or an async class such as gevent
+WORKER_CLASS = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+WORKERS = int(os.environ.get('WEB_CONCURRENCY',
+                             multiprocessing.cpu_count() * 2 + 1))
+# gunicorn turns sync into gthread when threads > 1, so only thread gthread
+THREADS = int(os.environ.get('GUNICORN_THREADS',
+                             '4' if WORKER_CLASS == 'gthread' else '1'))
+
+# Async workers multiplex connections rather than threads
+WORKER_CONNECTIONS = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', '1000'))
+
+# Async workers must monkey-patch before the app imports ssl and sockets
+ASYNC_WORKER = WORKER_CLASS in ('gevent', 'eventlet') or WORKER_CLASS.startswith(
+    ('gunicorn.workers.ggevent', 'gunicorn.workers.geventlet'))
+
+# Import the app once in the master so workers share it copy-on-write
+PRELOAD = os.environ.get(
+    'GUNICORN_PRELOAD', 'false' if ASYNC_WORKER else 'true').lower() in ('1', 'true', 'yes')
+
+# /process_openai blocks on the whole LLM pipeline, so allow it time
+TIMEOUT = int(os.environ.get('GUNICORN_TIMEOUT', '120'))
+GRACEFUL_TIMEOUT = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+KEEPALIVE = int(os.environ.get('GUNICORN_KEEPALIVE', '5'))
+
+# Recycle workers periodically to bound memory growth
+MAX_REQUESTS = int(os.environ.get('GUNICORN_MAX_REQUESTS', '1000'))
+MAX_REQUESTS_JITTER = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', '100'))
+
+
+def post_fork(server, worker):
+    """
+    Reconnect to MongoDB in each preloaded worker after it is forked.
+
+    Args:
+        server: The gunicorn arbiter.
+        worker: The newly forked worker.
+    """
+    # Without preloading the worker imports the app itself after forking
+    if not server.cfg.preload_app:
+        return
+
+    import app as flask_app
+    flask_app.connect_mongo()
+
+
+def build_options():
+    """
+    Collect the gunicorn settings from the environment.
+
+    Returns:
+        dict: The gunicorn configuration options.
+    """
+    return {
+        'bind': BIND,
+        'worker_class': WORKER_CLASS,
+        'workers': WORKERS,
+        'threads': THREADS,
+        'worker_connections': WORKER_CONNECTIONS,
+        'preload_app': PRELOAD,
+        'timeout': TIMEOUT,
+        'graceful_timeout': GRACEFUL_TIMEOUT,
+        'keepalive': KEEPALIVE,
+        'max_requests': MAX_REQUESTS,
+        'max_requests_jitter': MAX_REQUESTS_JITTER,
+        'post_fork': post_fork,
+    }
+
+
+class StandaloneApplication(BaseApplication):
+    """
+    Gunicorn application configured from Python instead of the CLI.
+    """
+
+    def __init__(self, options=None):
+        self.options = options or {}
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key.lower(), value)
+
+    def load(self):
+        from app import app
+        return app
+
+
 if __name__ == '__main__':
-    sys.argv = "gunicorn --bind 0.0.0.0:5151 app:app".split()
-    sys.exit(run())
+    sys.exit(StandaloneApplication(build_options()).run())